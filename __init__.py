@@ -3,4 +3,4 @@ DB_NAME="climate_db"
 DB_USER="postgres"
 DB_PASSWORD="andres12"
 DB_HOST="localhost"
-DB_PORT="5432"
\ No newline at end of file
+DB_PORT="6432"
\ No newline at end of file
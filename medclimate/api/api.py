@@ -1,32 +1,99 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional
+
+import psycopg2
+import sqlalchemy.exc
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from medclimate.database.db import dispose_engine
+from medclimate.database.postgeresql import DEFAULT_PAGE_SIZE, WeatherDatabase
+from medclimate.utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Records loaded per COPY batch by /weather/bulk
+BULK_BATCH_SIZE = 10_000
+
+# Set by /weather/bulk once records are loaded. Refreshing weather_daily_agg
+# recomputes the whole view, so it is done by the background task below, at
+# most once per DAILY_AGG_REFRESH_INTERVAL, instead of inside each upload.
+aggregates_stale = asyncio.Event()
+
+
+# One line of a /weather/bulk body. Validating here keeps bad values (e.g.
+# "temperature": "hot") from reaching COPY, where they would fail the batch.
+class BulkWeatherRecord(BaseModel):
+    timestamp: datetime
+    temperature: Optional[float]
+    humidity: Optional[float]
+    precipitation: Optional[float]
+    location: str = Field(min_length=1, max_length=100)
+
+
+async def refresh_stale_aggregates(db: WeatherDatabase, interval: float):
+    while True:
+        await aggregates_stale.wait()
+        aggregates_stale.clear()
+        try:
+            await run_in_threadpool(db.refresh_daily_aggregates)
+        except Exception:
+            logger.exception("Refreshing weather_daily_agg failed; retrying")
+            aggregates_stale.set()
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresher = asyncio.create_task(refresh_stale_aggregates(
+        WeatherDatabase(), get_settings().DAILY_AGG_REFRESH_INTERVAL
+    ))
+    yield
+    refresher.cancel()
+    # Release pooled database connections when the server stops
+    dispose_engine()
+
 
 # Create FastAPI instance with metadata
 app = FastAPI(
     title="MedClimate API",          # Shows in API documentation
     description="API for climate data analysis in Medellin",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson instead of the stdlib json encoder
 )
 
 # CORS Middleware configuration
 # This allows other websites/applications to call your API
 app.add_middleware(
     CORSMiddleware,
-    # Which origins (websites) can access your API:
-    allow_origins=["*"],       # "*" means all origins are allowed
-    # allow_origins=["http://localhost:3000"]  # More secure: only allow specific origins
+    # Which origins (websites) can access your API, from the CORS_ORIGINS setting:
+    allow_origins=get_settings().CORS_ORIGINS,
     
     # Allow browsers to send credentials (cookies, authorization headers):
     allow_credentials=True,
     
-    # Which HTTP methods are allowed:
-    allow_methods=["*"],       # "*" means all methods (GET, POST, etc.)
-    # allow_methods=["GET", "POST"]  # More secure: only specific methods
+    # Which HTTP methods are allowed (only the ones the API serves):
+    allow_methods=["GET", "POST"],
     
     # Which HTTP headers are allowed:
-    allow_headers=["*"],       # "*" means all headers
+    allow_headers=["Content-Type", "Authorization"],
+    
+    # How long (seconds) browsers may cache a preflight response:
+    max_age=86400,
 )
 
+# Compress responses larger than 1 KB when the client accepts gzip;
+# repetitive JSON weather records shrink several times over
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Define a route for the root endpoint "/"
 @app.get("/")                 # HTTP GET method decorator
 async def root():
@@ -37,7 +104,138 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Database dependency, overridable in tests via app.dependency_overrides
+def get_db() -> WeatherDatabase:
+    return WeatherDatabase()
+
+# Keyset pagination parameters shared by the list endpoints
+def pagination(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=10_000),
+    cursor_ts: Optional[datetime] = None,
+    cursor_id: Optional[int] = None
+) -> dict:
+    if (cursor_ts is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=422, detail="cursor_ts and cursor_id must be given together"
+        )
+    return {"limit": limit, "cursor_ts": cursor_ts, "cursor_id": cursor_id}
+
+# Pages are returned as a ready-made ORJSONResponse: orjson handles datetimes
+# natively, so FastAPI's per-value jsonable_encoder pass is skipped
+def page_response(page: dict) -> ORJSONResponse:
+    next_cursor = page["next_cursor"]
+    return ORJSONResponse({
+        "data": [row._asdict() for row in page["data"]],
+        "next_cursor": next_cursor and {
+            "cursor_ts": next_cursor[0], "cursor_id": next_cursor[1]
+        }
+    })
+
+# WeatherDatabase is synchronous (psycopg2), so every call is pushed to the
+# threadpool to keep the event loop free for other requests.
+
+# Extreme weather events (declared before /weather/{location} so it isn't
+# captured as a location name)
+@app.get("/weather/extremes")
+async def extreme_weather_events(
+    threshold_temp: float = 35.0,
+    threshold_precip: float = 50.0,
+    page: dict = Depends(pagination),
+    db: WeatherDatabase = Depends(get_db)
+):
+    result = await run_in_threadpool(
+        db.get_extreme_weather_events, threshold_temp, threshold_precip, **page
+    )
+    return page_response(result)
+
+# Weather records for a location, newest first
+@app.get("/weather/{location}")
+async def records_by_location(
+    location: str,
+    start_date: Optional[datetime] = None,
+    page: dict = Depends(pagination),
+    db: WeatherDatabase = Depends(get_db)
+):
+    result = await run_in_threadpool(
+        db.get_records_by_location, location, start_date, **page
+    )
+    return page_response(result)
+
+# Bulk ingest: the body is newline-delimited JSON, one record per line.
+# The body is streamed and loaded in batches of BULK_BATCH_SIZE with COPY,
+# so large uploads never sit in memory at once. Batches are committed as they
+# go: on an invalid line, or a batch the database rejects, earlier batches
+# stay loaded and the 422 error reports how many records were inserted.
+# The daily aggregates are refreshed later, in the background.
+@app.post("/weather/bulk")
+async def bulk_insert(request: Request, db: WeatherDatabase = Depends(get_db)):
+    inserted = 0
+    batch = []
+    pending = b""
+    line_number = 0
+
+    async def flush():
+        nonlocal inserted, batch
+        if batch:
+            try:
+                inserted += await run_in_threadpool(db.bulk_copy_weather_records, batch)
+            except (psycopg2.DataError, sqlalchemy.exc.DataError) as e:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"line": None, "error": str(e), "inserted": inserted}
+                )
+            batch = []
+
+    def parse(line: bytes):
+        try:
+            return BulkWeatherRecord.model_validate_json(line).model_dump()
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=422,
+                detail={"line": line_number, "error": str(e), "inserted": inserted}
+            )
+
+    try:
+        async for chunk in request.stream():
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    batch.append(parse(line))
+                if len(batch) >= BULK_BATCH_SIZE:
+                    await flush()
+        if pending.strip():
+            line_number += 1
+            batch.append(parse(pending))
+        await flush()
+    finally:
+        if inserted:
+            aggregates_stale.set()
+    return {"inserted": inserted}
+
+# Temperature statistics for a location in a date range
+@app.get("/weather/{location}/stats")
+async def temperature_stats(
+    location: str,
+    start_date: datetime,
+    end_date: datetime,
+    db: WeatherDatabase = Depends(get_db)
+):
+    stats = await run_in_threadpool(
+        db.get_average_temperatures, location, start_date, end_date
+    )
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No records in this range")
+    return stats
+
 # Run the application if this file is run directly
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Multiple workers need the app as an import string, not the object
+    uvicorn.run(
+        "medclimate.api.api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=get_settings().WEB_CONCURRENCY
+    )
\ No newline at end of file
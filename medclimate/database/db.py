@@ -0,0 +1,56 @@
+# medclimate/database/db.py
+from functools import lru_cache
+
+from sqlalchemy import URL, create_engine
+from sqlalchemy.engine import Engine
+
+from medclimate.utils.config import get_settings
+
+# TCP keepalives on every connection, so idle pooled connections are kept
+# open through NAT/firewalls and dead peers are detected within ~80 s
+KEEPALIVE_ARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
+
+@lru_cache()
+def get_engine() -> Engine:
+    """
+    Return the process-wide SQLAlchemy engine, creating it on first call.
+
+    The engine's QueuePool is the single connection pool of the worker.
+    Connections stay open between requests (kept alive by KEEPALIVE_ARGS)
+    for up to DB_POOL_RECYCLE seconds; pool_pre_ping replaces any the server
+    dropped in the meantime.
+
+    Usage:
+        with get_engine().begin() as conn:
+            conn.execute(...)
+    """
+    settings = get_settings()
+    url = URL.create(
+        "postgresql+psycopg2",
+        username=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME,
+    )
+    return create_engine(
+        url,
+        **settings.pool_config,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=KEEPALIVE_ARGS,
+    )
+
+
+def dispose_engine() -> None:
+    """
+    Close every pooled connection, if the engine was ever created.
+    Call it on application shutdown.
+    """
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
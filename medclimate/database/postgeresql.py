@@ -1,20 +1,230 @@
 # database/postgresql.py
-from typing import Dict, List, Optional
-from datetime import datetime
-import psycopg2
+import csv
+import io
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+from datetime import datetime, timedelta, timezone
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
-from medclimate.config.settings import DATABASE_CONFIG
+from sqlalchemy import insert
+from medclimate.database.db import get_engine
+from medclimate.model.base import WeatherRecord
+from medclimate.utils.cache import TTLCache
+from medclimate.utils.config import get_settings
+
+# Batches smaller than this go through execute_values; COPY only pays off
+# once its fixed setup cost is spread over enough rows.
+COPY_THRESHOLD = 100
+
+WEATHER_COLUMNS = ("timestamp", "temperature", "humidity", "precipitation", "location")
+
+
+class WeatherRow(NamedTuple):
+    """
+    A weather record as returned by the read queries.
+    Plain tuples are far cheaper to build than one dict per row; use
+    `row._asdict()` where a mapping is needed.
+    """
+    id: int
+    timestamp: datetime
+    temperature: Optional[float]
+    humidity: Optional[float]
+    precipitation: Optional[float]
+    location: Optional[str]
+
+
+# Page size used when callers don't ask for one
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _check_cursor(cursor_ts: Optional[datetime], cursor_id: Optional[int]):
+    if (cursor_ts is None) != (cursor_id is None):
+        raise ValueError("cursor_ts and cursor_id must be given together")
+
+
+def _check_limit(limit: int):
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; convert aware values to match."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _record_values(record: Dict) -> Dict:
+    """The columns of a record to store, with the timestamp as naive UTC."""
+    values = {column: record[column] for column in WEATHER_COLUMNS}
+    values["timestamp"] = _naive_utc(values["timestamp"])
+    return values
+
+
+def _page(rows: List[WeatherRow], limit: int) -> Dict:
+    """Wrap a page of rows with the keyset cursor of the next page."""
+    next_cursor = (rows[-1].timestamp, rows[-1].id) if len(rows) == limit else None
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+# Sentinels standing in for "no bound" so each hot query has one fixed text
+_NO_START = datetime.min
+_NO_CURSOR = (datetime.max, 2**31 - 1)
+
+# Hot read queries: name -> ((parameter name, SQL type), ...), query text.
+# With DB_PREPARED_STATEMENTS they are prepared the first time a pooled
+# connection runs one of them and then run with EXECUTE, skipping parse and
+# planning; otherwise the same text is executed directly. Preparing lazily
+# keeps DDL (create_tables on an empty database) off this path.
+_STATEMENTS = {
+    "weather_by_loc": (
+        (("location", "varchar"), ("start_date", "timestamp"),
+         ("cursor_ts", "timestamp"), ("cursor_id", "integer"), ("limit", "integer")),
+        """
+        SELECT id, timestamp, temperature, humidity, precipitation, location
+        FROM weather_records
+        WHERE location = %(location)s
+        AND timestamp >= %(start_date)s
+        -- The plain timestamp bound lets the (location, timestamp) index seek
+        AND timestamp <= %(cursor_ts)s
+        AND (timestamp, id) < (%(cursor_ts)s, %(cursor_id)s)
+        ORDER BY timestamp DESC, id DESC
+        LIMIT %(limit)s
+        """
+    ),
+    "weather_stats": (
+        (("location", "varchar"), ("start_date", "timestamp"), ("end_date", "timestamp"),
+         ("first_day", "timestamp"), ("last_day", "timestamp")),
+        """
+        WITH parts AS (
+            SELECT sum_temp, temp_count, min_temp, max_temp, total_records
+            FROM weather_daily_agg
+            WHERE location = %(location)s
+            AND day >= %(first_day)s AND day < %(last_day)s
+            UNION ALL
+            SELECT SUM(temperature::double precision), COUNT(temperature), MIN(temperature),
+                   MAX(temperature), COUNT(*)
+            FROM weather_records
+            WHERE location = %(location)s
+            AND timestamp BETWEEN %(start_date)s AND %(end_date)s
+            AND (timestamp < %(first_day)s OR timestamp >= %(last_day)s)
+        )
+        SELECT 
+            %(location)s as location,
+            SUM(sum_temp) / NULLIF(SUM(temp_count), 0) as avg_temp,
+            MIN(min_temp) as min_temp,
+            MAX(max_temp) as max_temp,
+            SUM(total_records)::bigint as total_records
+        FROM parts
+        HAVING SUM(total_records) > 0
+        """
+    ),
+    # Trailing window over whole days of weather_daily_agg. Rows up to
+    # `preceding` before start_date are read so the first windows are complete.
+    "weather_rolling": (
+        (("location", "varchar"), ("start_date", "timestamp"),
+         ("end_date", "timestamp"), ("preceding", "interval")),
+        """
+        SELECT day, rolling_avg_temp, rolling_min_temp, rolling_max_temp, total_records
+        FROM (
+            SELECT
+                day,
+                SUM(sum_temp) OVER w / NULLIF(SUM(temp_count) OVER w, 0) AS rolling_avg_temp,
+                MIN(min_temp) OVER w AS rolling_min_temp,
+                MAX(max_temp) OVER w AS rolling_max_temp,
+                (SUM(total_records) OVER w)::bigint AS total_records
+            FROM weather_daily_agg
+            WHERE location = %(location)s
+            AND day >= %(start_date)s - %(preceding)s
+            AND day <= %(end_date)s
+            WINDOW w AS (ORDER BY day RANGE BETWEEN %(preceding)s PRECEDING AND CURRENT ROW)
+        ) rolling
+        WHERE day >= %(start_date)s
+        ORDER BY day
+        """
+    ),
+    # PostgreSQL keeps planning this one per call while a custom plan (which
+    # can use the idx_weather_hot partial index) is cheaper than the generic one
+    "weather_extremes": (
+        # REAL like the columns: a reading stored as 35.1 is 35.099998 in
+        # float4 and would fail ">= 35.1" compared as double precision
+        (("threshold_temp", "real"), ("threshold_precip", "real"),
+         ("cursor_ts", "timestamp"), ("cursor_id", "integer"), ("limit", "integer")),
+        """
+        SELECT id, timestamp, temperature, humidity, precipitation, location
+        FROM weather_records
+        WHERE (temperature >= %(threshold_temp)s::real
+               OR precipitation >= %(threshold_precip)s::real)
+        AND timestamp <= %(cursor_ts)s
+        AND (timestamp, id) < (%(cursor_ts)s, %(cursor_id)s)
+        ORDER BY timestamp DESC, id DESC
+        LIMIT %(limit)s
+        """
+    )
+}
+
+
+def _prepare_statements(conn):
+    """
+    PREPARE every hot query on a pooled connection, once per DBAPI connection.
+    The flag lives in the pool's per-connection info, which SQLAlchemy clears
+    whenever the underlying connection is replaced.
+    """
+    if conn.info.get("statements_prepared"):
+        return
+    with conn.cursor() as cur:
+        for name, (args, query) in _STATEMENTS.items():
+            placeholders = {arg: f"${i}" for i, (arg, _) in enumerate(args, 1)}
+            types = ", ".join(sql_type for _, sql_type in args)
+            cur.execute(f"PREPARE {name} ({types}) AS {query % placeholders}")
+    conn.commit()
+    conn.info["statements_prepared"] = True
+
+
+def _execute(conn, cur, name: str, params: Dict):
+    """Run a hot query, through EXECUTE when statements are prepared."""
+    args, query = _STATEMENTS[name]
+    if get_settings().DB_PREPARED_STATEMENTS:
+        _prepare_statements(conn)
+        cur.execute(
+            f"EXECUTE {name} ({', '.join(['%s'] * len(args))})",
+            [params[arg] for arg, _ in args]
+        )
+    else:
+        cur.execute(query, params)
+
+
+# First days of the months whose partition this process has already created
+# (or found covered by weather_records_default), so inserts only issue DDL
+# for months they haven't seen before
+_checked_months: Set[datetime] = set()
+
+
+@lru_cache()
+def _records_cache() -> TTLCache:
+    """
+    Recent get_records_by_location results, keyed by the call arguments with
+    the location first so inserts can invalidate a single location. Pages
+    are sized by their row count, so RECORDS_CACHE_MAX_ROWS bounds memory
+    whatever page size callers ask for.
+    """
+    settings = get_settings()
+    return TTLCache(ttl=settings.RECORDS_CACHE_TTL, maxsize=settings.RECORDS_CACHE_MAX_ROWS)
+
+
+def _invalidate_locations(records: List[Dict]):
+    locations = {r["location"] for r in records}
+    _records_cache().invalidate(lambda key: key[0] in locations)
+
 
 class WeatherDatabase:
     """
     A class to handle interactions with the weather records database.
 
     This class provides methods to connect to a PostgreSQL database and perform
-    operations related to weather data storage and retrieval. It uses connection
-    parameters from DATABASE_CONFIG.
-
-    Attributes:
-        connection_params (dict): Database connection parameters loaded from settings
+    operations related to weather data storage and retrieval. Connections are
+    borrowed from the pool of the process-wide SQLAlchemy engine (see db.py).
 
     Example:
         >>> db = WeatherDatabase()
@@ -23,48 +233,107 @@ class WeatherDatabase:
     
     def __init__(self):
         """
-        Initialize database connection parameters from settings.
+        Bind to the shared engine.
         Usage:
             db = WeatherDatabase()
         """
-        self.connection_params = DATABASE_CONFIG
+        self.engine = get_engine()
 
-    def connect(self):
+    @contextmanager
+    def connect(self) -> Iterator:
         """
-        Create and return a database connection.
-        Used internally by other methods.
+        Borrow a raw psycopg2 connection from the engine's pool and give it
+        back afterwards. Used internally by the methods that need
+        driver-level features (COPY, prepared statements, RealDictCursor).
         
-        Returns:
-            psycopg2 connection object
+        Yields:
+            pooled psycopg2 connection
         
         Usage:
             with self.connect() as conn:
                 # do something with connection
         """
-        return psycopg2.connect(**self.connection_params)
+        conn = self.engine.raw_connection()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # Returns the connection to the pool, which rolls back any open
+            # transaction
+            conn.close()
 
     def create_tables(self):
         """
         Create the weather_records table if it doesn't exist.
         Should be run once when setting up the database.
         
+        The table is range-partitioned by month on timestamp, so queries
+        filtered by time only touch the relevant partitions and old data can
+        be dropped a month at a time. Partitions for the current and the
+        next two months are created here; the insert methods create the
+        partitions of any other month they load into. Rows outside every
+        monthly partition land in weather_records_default.
+        
+        Note: an existing, non-partitioned weather_records table is left
+        untouched and has to be migrated by hand.
+        
         Usage:
             db = WeatherDatabase()
             db.create_tables()
         """
         create_table_query = """
         CREATE TABLE IF NOT EXISTS weather_records (
-            id SERIAL PRIMARY KEY,                    -- Auto-incrementing ID
+            id SERIAL,                                -- Auto-incrementing ID
             timestamp TIMESTAMP NOT NULL,             -- When the measurement was taken
-            temperature FLOAT,                        -- Temperature in Celsius
-            humidity FLOAT,                           -- Humidity percentage
-            precipitation FLOAT,                      -- Precipitation in mm
+            -- REAL (4 bytes) is ample for sensor precision and packs more
+            -- rows per page than FLOAT (double precision, 8 bytes)
+            temperature REAL,                         -- Temperature in Celsius
+            humidity REAL,                            -- Humidity percentage
+            precipitation REAL,                       -- Precipitation in mm
             location VARCHAR(100),                    -- Location name
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- Record creation time
-        );
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- Record creation time
+            PRIMARY KEY (id, timestamp)               -- Must include the partition key
+        ) PARTITION BY RANGE (timestamp);
+        
+        CREATE TABLE IF NOT EXISTS weather_records_default
+        PARTITION OF weather_records DEFAULT;
         
+        -- Indexes on the parent are created on every partition
         CREATE INDEX IF NOT EXISTS idx_weather_location_timestamp 
         ON weather_records(location, timestamp);
+        
+        -- Timestamps arrive roughly in order, so a BRIN index covers
+        -- time-range scans at a fraction of the size of a btree
+        CREATE INDEX IF NOT EXISTS idx_weather_ts_brin
+        ON weather_records USING BRIN (timestamp) WITH (pages_per_range = 32);
+        
+        -- Partial index holding only extreme rows (default thresholds of
+        -- get_extreme_weather_events); usable whenever the query thresholds
+        -- are at least as strict
+        CREATE INDEX IF NOT EXISTS idx_weather_hot
+        ON weather_records(timestamp, id)
+        WHERE temperature >= 35 OR precipitation >= 50;
+        
+        -- Per-day, per-location rollup used by get_average_temperatures.
+        -- Sums and counts (not averages) are kept so days can be combined.
+        CREATE MATERIALIZED VIEW IF NOT EXISTS weather_daily_agg AS
+        SELECT
+            location,
+            date_trunc('day', timestamp) AS day,
+            -- Summed in double precision; a REAL sum loses precision
+            SUM(temperature::double precision) AS sum_temp,
+            COUNT(temperature) AS temp_count,
+            MIN(temperature) AS min_temp,
+            MAX(temperature) AS max_temp,
+            COUNT(*) AS total_records
+        FROM weather_records
+        GROUP BY location, date_trunc('day', timestamp);
+        
+        -- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_weather_daily_agg_location_day
+        ON weather_daily_agg(location, day);
         """
         
         with self.connect() as conn:
@@ -72,6 +341,90 @@ class WeatherDatabase:
                 cur.execute(create_table_query)
             conn.commit()
 
+        self.create_monthly_partitions(datetime.now(), months=3)
+
+    @staticmethod
+    def _partition_name(month: datetime) -> str:
+        return f"weather_records_y{month.year}m{month.month:02d}"
+
+    @staticmethod
+    def _next_month(month: datetime) -> datetime:
+        if month.month == 12:
+            return month.replace(year=month.year + 1, month=1)
+        return month.replace(month=month.month + 1)
+
+    def create_monthly_partitions(self, start: datetime, months: int = 1):
+        """
+        Create monthly partitions of weather_records, starting with the month
+        that contains `start`. Existing partitions are skipped.
+        
+        A partition can't be created while weather_records_default still
+        holds rows for that month, so such months are skipped as well and
+        keep landing in the default partition until its rows are moved out.
+        
+        Args:
+            start (datetime): Any moment in the first month to create
+            months (int): Number of consecutive months
+        
+        Usage:
+            db.create_monthly_partitions(datetime(2024, 1, 1), months=12)
+        """
+        month = datetime(start.year, start.month, 1)
+        wanted = []
+        for _ in range(months):
+            wanted.append(month)
+            month = self._next_month(month)
+        self._create_partitions(wanted)
+
+    def _create_partitions(self, months: Iterable[datetime]):
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                for month in months:
+                    next_month = self._next_month(month)
+                    cur.execute(
+                        "SELECT EXISTS (SELECT 1 FROM weather_records_default "
+                        "WHERE timestamp >= %s AND timestamp < %s)",
+                        (month, next_month)
+                    )
+                    if not cur.fetchone()[0]:
+                        cur.execute(
+                            sql.SQL(
+                                "CREATE TABLE IF NOT EXISTS {} PARTITION OF weather_records "
+                                "FOR VALUES FROM (%s) TO (%s)"
+                            ).format(sql.Identifier(self._partition_name(month))),
+                            (month, next_month)
+                        )
+                    _checked_months.add(month)
+            conn.commit()
+
+    def _ensure_partitions(self, records: List[Dict]):
+        """Create the partitions of the months in `records` before loading them."""
+        months = {datetime(r["timestamp"].year, r["timestamp"].month, 1) for r in records}
+        if not months <= _checked_months:
+            self._create_partitions(sorted(months - _checked_months))
+
+    def drop_monthly_partition(self, month: datetime):
+        """
+        Drop the partition holding all records of the given month.
+        Much cheaper than DELETE for retention, as no rows are scanned.
+        
+        Args:
+            month (datetime): Any moment in the month to drop
+        
+        Usage:
+            db.drop_monthly_partition(datetime(2020, 1, 1))
+        """
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql.SQL("DROP TABLE IF EXISTS {}").format(
+                        sql.Identifier(self._partition_name(month))
+                    )
+                )
+            conn.commit()
+        _checked_months.discard(datetime(month.year, month.month, 1))
+        _records_cache().clear()
+
     def insert_weather_record(self, record: Dict) -> int:
         """
         Insert a new weather record into the database.
@@ -79,7 +432,7 @@ class WeatherDatabase:
         Args:
             record (dict): Dictionary containing weather data
                 {
-                    "timestamp": datetime object,
+                    "timestamp": datetime object (aware ones are stored as UTC),
                     "temperature": float,
                     "humidity": float,
                     "precipitation": float,
@@ -98,57 +451,186 @@ class WeatherDatabase:
                 "location": "New York"
             })
         """
-        query = """
-        INSERT INTO weather_records (timestamp, temperature, humidity, precipitation, location)
-        VALUES (%(timestamp)s, %(temperature)s, %(humidity)s, %(precipitation)s, %(location)s)
-        RETURNING id;
+        values = _record_values(record)
+        self._ensure_partitions([values])
+        stmt = insert(WeatherRecord).returning(WeatherRecord.id)
+        
+        with self.engine.begin() as conn:
+            record_id = conn.execute(stmt, values).scalar_one()
+        _invalidate_locations([record])
+        return record_id
+
+    def insert_weather_records(self, records: List[Dict]) -> List[int]:
+        """
+        Insert many weather records in a single round trip.
+        Rows are sent as multi-row INSERT statements of up to 1000 rows each
+        and committed together.
+        
+        Args:
+            records (List[dict]): Weather records, same shape as in
+                insert_weather_record
+        
+        Returns:
+            List[int]: IDs of the inserted records, in input order
+        
+        Usage:
+            ids = db.insert_weather_records([
+                {"timestamp": datetime.now(), "temperature": 23.5,
+                 "humidity": 65.0, "precipitation": 0.0, "location": "New York"},
+                {"timestamp": datetime.now(), "temperature": 18.0,
+                 "humidity": 80.0, "precipitation": 2.5, "location": "Medellin"},
+            ])
         """
+        if not records:
+            return []
+
+        # Executed as multi-row INSERT ... VALUES batches ("insertmanyvalues")
+        stmt = insert(WeatherRecord).returning(
+            WeatherRecord.id, sort_by_parameter_order=True
+        )
+        values = [_record_values(r) for r in records]
+        self._ensure_partitions(values)
+        
+        with self.engine.begin() as conn:
+            record_ids = conn.execute(stmt, values).scalars().all()
+        _invalidate_locations(records)
+        return record_ids
+
+    def bulk_copy_weather_records(self, records: List[Dict], refresh: bool = False) -> int:
+        """
+        Load a large batch of weather records with COPY FROM STDIN.
+        Batches below COPY_THRESHOLD rows are handed to insert_weather_records
+        instead. Unlike the INSERT methods, no record IDs are returned.
+        
+        Args:
+            records (List[dict]): Weather records, same shape as in
+                insert_weather_record
+            refresh (bool): Refresh weather_daily_agg after the load. The
+                refresh recomputes the whole view, so leave it off for
+                frequent loads and refresh on a schedule instead
+        
+        Returns:
+            int: Number of records loaded
+        
+        Usage:
+            loaded = db.bulk_copy_weather_records(records_from_sensor_dump)
+        """
+        if len(records) < COPY_THRESHOLD:
+            loaded = len(self.insert_weather_records(records))
+            if refresh:
+                self.refresh_daily_aggregates()
+            return loaded
+
+        values = [_record_values(r) for r in records]
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for v in values:
+            # None is written as \N (the NULL option below), so an empty
+            # location is stored as '' exactly like the INSERT path does
+            writer.writerow([r"\N" if v[column] is None else v[column]
+                             for column in WEATHER_COLUMNS])
+        buf.seek(0)
+        self._ensure_partitions(values)
+
+        query = (
+            f"COPY weather_records ({', '.join(WEATHER_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT CSV, NULL '\\N')"
+        )
         
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, record)
-                record_id = cur.fetchone()[0]
+                cur.copy_expert(query, buf)
             conn.commit()
-        return record_id
+        _invalidate_locations(records)
+        if refresh:
+            self.refresh_daily_aggregates()
+        return len(records)
 
-    def get_records_by_location(self, location: str, start_date: Optional[datetime] = None) -> List[Dict]:
+    def get_records_by_location(self, location: str, start_date: Optional[datetime] = None,
+                                limit: int = DEFAULT_PAGE_SIZE,
+                                cursor_ts: Optional[datetime] = None,
+                                cursor_id: Optional[int] = None) -> Dict:
         """
-        Retrieve weather records for a specific location.
+        Retrieve one page of weather records for a specific location,
+        newest first.
+        Results are cached in-process for RECORDS_CACHE_TTL seconds; inserts
+        through this class invalidate the cached results of their locations.
+        
+        Pages are keyset-paginated on (timestamp, id): pass the previous
+        page's next_cursor as cursor_ts/cursor_id to get the following page.
         
         Args:
             location (str): Location name to filter by
             start_date (datetime, optional): Only get records after this date
+            limit (int): Maximum number of records per page, at least 1
+            cursor_ts (datetime, optional): Timestamp part of next_cursor
+            cursor_id (int, optional): ID part of next_cursor
         
         Returns:
-            List[Dict]: List of weather records
+            Dict: {"data": List[WeatherRow], "next_cursor": (timestamp, id)
+                or None on the last page}
         
         Usage:
-            records = db.get_records_by_location("New York", 
-                                               start_date=datetime(2024, 1, 1))
+            page = db.get_records_by_location("New York", 
+                                              start_date=datetime(2024, 1, 1))
+            if page["next_cursor"]:
+                ts, record_id = page["next_cursor"]
+                page = db.get_records_by_location("New York",
+                                                  start_date=datetime(2024, 1, 1),
+                                                  cursor_ts=ts, cursor_id=record_id)
         """
-        query = """
-        SELECT id, timestamp, temperature, humidity, precipitation, location
-        FROM weather_records
-        WHERE location = %s
-        """
-        params = [location]
+        _check_limit(limit)
+        _check_cursor(cursor_ts, cursor_id)
+        if start_date is not None:
+            start_date = _naive_utc(start_date)
+        cache_key = (location, start_date, limit, cursor_ts, cursor_id)
+        cached = _records_cache().get(cache_key)
+        if cached is not None:
+            return cached
+
+        cursor = (cursor_ts, cursor_id) if cursor_ts is not None else _NO_CURSOR
+        params = {
+            "location": location,
+            "start_date": start_date or _NO_START,
+            "cursor_ts": cursor[0],
+            "cursor_id": cursor[1],
+            "limit": limit
+        }
         
-        if start_date:
-            query += " AND timestamp >= %s"
-            params.append(start_date)
-            
-        query += " ORDER BY timestamp DESC"
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                _execute(conn, cur, "weather_by_loc", params)
+                page = _page(list(map(WeatherRow._make, cur)), limit)
+        _records_cache().set(cache_key, page, size=max(1, len(page["data"])))
+        return page
+
+    def refresh_daily_aggregates(self):
+        """
+        Recompute the weather_daily_agg materialized view.
+        Runs CONCURRENTLY so readers are never blocked, but recomputes every
+        day of every location, so call it on a schedule (e.g. with pg_cron)
+        rather than after each insert. The API refreshes it in the
+        background after bulk uploads, see DAILY_AGG_REFRESH_INTERVAL.
         
+        Usage:
+            db.refresh_daily_aggregates()
+        """
         with self.connect() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params)
-                return cur.fetchall()
+            with conn.cursor() as cur:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY weather_daily_agg;")
+            conn.commit()
 
     def get_average_temperatures(self, location: str, start_date: datetime, 
                                end_date: datetime) -> Dict:
         """
         Calculate temperature statistics for a location in a date range.
         
+        Whole days inside the range are read from the weather_daily_agg view;
+        only the partial days at either end are aggregated from raw records.
+        Whole days therefore reflect the data as of the last
+        refresh_daily_aggregates call. Timezone-aware bounds are converted
+        to UTC, in which timestamps are stored.
+        
         Args:
             location (str): Location to analyze
             start_date (datetime): Start of date range
@@ -164,53 +646,114 @@ class WeatherDatabase:
                 datetime(2024, 2, 1)
             )
         """
-        query = """
-        SELECT 
-            location,
-            AVG(temperature) as avg_temp,
-            MIN(temperature) as min_temp,
-            MAX(temperature) as max_temp,
-            COUNT(*) as total_records
-        FROM weather_records
-        WHERE location = %s
-        AND timestamp BETWEEN %s AND %s
-        GROUP BY location;
-        """
+        start_date, end_date = _naive_utc(start_date), _naive_utc(end_date)
+        # [first_day, last_day) is the span of whole days within the range.
+        # When it is empty, the raw filter below covers the entire range.
+        first_day = datetime(start_date.year, start_date.month, start_date.day)
+        if first_day < start_date:
+            first_day += timedelta(days=1)
+        last_day = datetime(end_date.year, end_date.month, end_date.day)
+
+        params = {
+            "location": location,
+            "start_date": start_date,
+            "end_date": end_date,
+            "first_day": first_day,
+            "last_day": last_day
+        }
         
         with self.connect() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (location, start_date, end_date))
+                _execute(conn, cur, "weather_stats", params)
                 return cur.fetchone()
 
+    def get_rolling_temperature(self, location: str, start_date: datetime,
+                                end_date: datetime,
+                                window: timedelta = timedelta(days=7)) -> List[Dict]:
+        """
+        Calculate rolling temperature statistics per day for a location.
+        
+        Each day's values cover the `window` of days ending on that day,
+        computed by PostgreSQL window functions over the weather_daily_agg
+        view, so only one row per day leaves the database. Like the view,
+        results reflect the data as of the last refresh_daily_aggregates call.
+        
+        Args:
+            location (str): Location to analyze
+            start_date (datetime): First day to report
+            end_date (datetime): Last day to report
+            window (timedelta): Window length, whole days of at least one day
+        
+        Returns:
+            List[Dict]: One row per day with data: day, rolling_avg_temp,
+                rolling_min_temp, rolling_max_temp, total_records
+        
+        Usage:
+            weekly = db.get_rolling_temperature(
+                "Medellin",
+                datetime(2024, 1, 1),
+                datetime(2024, 3, 1),
+                window=timedelta(days=7)
+            )
+        """
+        if window < timedelta(days=1):
+            raise ValueError("window must be at least one day")
+        start_date, end_date = _naive_utc(start_date), _naive_utc(end_date)
+
+        params = {
+            "location": location,
+            "start_date": datetime(start_date.year, start_date.month, start_date.day),
+            "end_date": end_date,
+            # The current day is part of the window
+            "preceding": window - timedelta(days=1)
+        }
+        
+        with self.connect() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                _execute(conn, cur, "weather_rolling", params)
+                return cur.fetchall()
+
     def get_extreme_weather_events(self, threshold_temp: float = 35.0, 
-                                 threshold_precip: float = 50.0) -> List[Dict]:
+                                 threshold_precip: float = 50.0,
+                                 limit: int = DEFAULT_PAGE_SIZE,
+                                 cursor_ts: Optional[datetime] = None,
+                                 cursor_id: Optional[int] = None) -> Dict:
         """
-        Find extreme weather events based on thresholds.
+        Find one page of extreme weather events based on thresholds,
+        newest first. Pagination works as in get_records_by_location.
         
         Args:
             threshold_temp (float): Temperature threshold in Celsius
             threshold_precip (float): Precipitation threshold in mm
+            limit (int): Maximum number of records per page, at least 1
+            cursor_ts (datetime, optional): Timestamp part of next_cursor
+            cursor_id (int, optional): ID part of next_cursor
         
         Returns:
-            List[Dict]: List of extreme weather records
+            Dict: {"data": List[WeatherRow], "next_cursor": (timestamp, id)
+                or None on the last page}
         
         Usage:
             extreme_events = db.get_extreme_weather_events(
                 threshold_temp=35.0,
                 threshold_precip=50.0
-            )
-        """
-        query = """
-        SELECT *
-        FROM weather_records
-        WHERE temperature >= %s OR precipitation >= %s
-        ORDER BY timestamp DESC;
+            )["data"]
         """
+        _check_limit(limit)
+        _check_cursor(cursor_ts, cursor_id)
+        cursor = (cursor_ts, cursor_id) if cursor_ts is not None else _NO_CURSOR
+        params = {
+            "threshold_temp": threshold_temp,
+            "threshold_precip": threshold_precip,
+            "cursor_ts": cursor[0],
+            "cursor_id": cursor[1],
+            "limit": limit
+        }
         
         with self.connect() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (threshold_temp, threshold_precip))
-                return cur.fetchall()
+            with conn.cursor() as cur:
+                _execute(conn, cur, "weather_extremes", params)
+                return _page(list(map(WeatherRow._make, cur)), limit)
 
 # Example usage
 if __name__ == "__main__":
@@ -5,6 +5,6 @@ from datetime import datetime, timedelta
 # Import your internal logic/services
 from services.weather_service import WeatherService
 from services.analysis_service import AnalysisService
-from config.settings import Settings
+from utils.config import Settings
 
 app = FastAPI(title="MedClimate API")
\ No newline at end of file
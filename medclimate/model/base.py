@@ -1,18 +1,21 @@
 # medclimate/models/base.py
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, Float, DateTime, String
+from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Integer, REAL, DateTime, String, func
 
 Base = declarative_base()
 
 class WeatherRecord(Base):
     __tablename__ = "weather_records"
     
-    id = Column(Integer, primary_key=True)
-    timestamp = Column(DateTime, nullable=False)
-    temperature = Column(Float)
-    humidity = Column(Float)
-    precipitation = Column(Float)
-    location = Column(String)
+    # The table is partitioned by timestamp, which therefore is part of the key.
+    # autoincrement must be explicit on a composite key for id to stay SERIAL
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    timestamp = Column(DateTime, primary_key=True, nullable=False)
+    temperature = Column(REAL)
+    humidity = Column(REAL)
+    precipitation = Column(REAL)
+    location = Column(String(100))
+    created_at = Column(DateTime, server_default=func.now())
     
     def __repr__(self):
-        return f"<WeatherRecord(timestamp={self.timestamp}, temp={self.temperature}°C)>"
\ No newline at end of file
+        return f"<WeatherRecord(timestamp={self.timestamp}, temp={self.temperature}°C)>"
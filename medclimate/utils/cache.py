@@ -0,0 +1,69 @@
+# medclimate/utils/cache.py
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache whose entries expire after `ttl` seconds.
+    `maxsize` bounds the total size of the entries, each counting as the
+    `size` it was stored with (1 by default).
+
+    Each uvicorn worker holds its own copy, so an invalidation in one worker
+    doesn't reach the others; the TTL bounds how stale they can get.
+
+    Example:
+        >>> cache = TTLCache(ttl=60)
+        >>> cache.set(("Medellin", None), rows)
+        >>> cache.get(("Medellin", None))
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any, int]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int = 1):
+        """
+        Store a value, evicting the oldest entries until it fits.
+        Values larger than maxsize on their own are not cached.
+        """
+        with self._lock:
+            self._remove(key)
+            if size > self.maxsize:
+                return
+            while self._size + size > self.maxsize:
+                self._remove(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value, size)
+            self._size += size
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches the predicate."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
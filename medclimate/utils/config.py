@@ -1,10 +1,13 @@
 # medclimate/utils/config.py
+import os
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import List, Optional
 
 class Settings(BaseSettings):
-    # API Settings
-    API_KEY: str
+    # API Settings (only needed by the external weather API client)
+    API_KEY: Optional[str] = None
     API_URL: str = "https://api.weatherapi.com/v1"
     
     # Database Settings
@@ -14,9 +17,50 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str = "medclimate"
     
+    # Server Settings: uvicorn workers, defaulting to the 2n+1 heuristic
+    WEB_CONCURRENCY: int = Field(default_factory=lambda: (os.cpu_count() or 1) * 2 + 1)
+    
+    # Connection pool sizing. Every worker process keeps its own pool, so the
+    # server's max_connections is split evenly between the workers.
+    DB_MAX_CONNECTIONS: int = 100
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    # Seconds a pooled connection is reused before being replaced; keep it
+    # below any idle timeout of the server or PgBouncer
+    DB_POOL_RECYCLE: int = 1800
+    
+    # Prepare the hot read queries once per connection. Off by default, as
+    # PgBouncer in transaction pooling mode (see docker-compose.yaml) can't
+    # keep SQL-level prepared statements across transactions; turn on only
+    # when connecting to PostgreSQL directly.
+    DB_PREPARED_STATEMENTS: bool = False
+    
+    # Origins allowed to call the API from a browser, as a JSON list in the
+    # environment, e.g. CORS_ORIGINS='["https://medclimate.example"]'
+    CORS_ORIGINS: List[str] = ["http://localhost:3000"]
+    
+    # Seconds a cached get_records_by_location result stays valid
+    RECORDS_CACHE_TTL: float = 60
+    # Rows cached per worker across all cached pages; bounds the cache's memory
+    RECORDS_CACHE_MAX_ROWS: int = 100_000
+    
+    # Minimum seconds between background refreshes of the daily aggregates
+    # after /weather/bulk uploads (per worker)
+    DAILY_AGG_REFRESH_INTERVAL: float = 60
+    
     class Config:
         env_file = ".env"
 
+    @property
+    def pool_config(self) -> dict:
+        """pool_size/max_overflow for the per-worker SQLAlchemy engine"""
+        budget = max(1, self.DB_MAX_CONNECTIONS // self.WEB_CONCURRENCY)
+        pool_size = self.DB_POOL_SIZE or min(20, budget)
+        max_overflow = self.DB_MAX_OVERFLOW
+        if max_overflow is None:
+            max_overflow = min(10, max(0, budget - pool_size))
+        return {"pool_size": pool_size, "max_overflow": max_overflow}
+
 @lru_cache()
 def get_settings() -> Settings:
-    return Settings()
\ No newline at end of file
+    return Settings()
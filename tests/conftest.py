@@ -0,0 +1,22 @@
+import os
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+# Settings requires database credentials; the API tests never connect
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+# Database tests only run against an explicitly named, throwaway database;
+# its tables are dropped and recreated
+if os.getenv("TEST_DB_NAME"):
+    os.environ["DB_NAME"] = os.environ["TEST_DB_NAME"]
+
+from medclimate.api import app  # noqa: E402 (needs the environment above)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """One in-process ASGI client for the whole test session"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
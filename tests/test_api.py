@@ -1,21 +1,214 @@
+import asyncio
+from datetime import datetime
+
+import psycopg2.errors
+import pytest
+
 from medclimate.api import app
-from fastapi.testclient import TestClient
+from medclimate.api.api import aggregates_stale, get_db, refresh_stale_aggregates
+from medclimate.database.postgeresql import WeatherRow
 
-MedAPI = TestClient(app)
+# All tests share the session-wide event loop and client from conftest.py
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
+class FakeWeatherDatabase:
+    """In-memory stand-in for WeatherDatabase"""
 
-def test_read_main():
-    """Test the root endpoint"""
-    response = MedAPI.get("/")
+    def __init__(self):
+        self.calls = []
+        self.loaded = []
+        self.load_error = None
+        self.refreshes = 0
+
+    def get_records_by_location(self, location, start_date=None, limit=1000,
+                                cursor_ts=None, cursor_id=None):
+        self.calls.append(("get_records_by_location", location, start_date,
+                           limit, cursor_ts, cursor_id))
+        row = WeatherRow(1, datetime(2024, 1, 1, 12), 23.5, 65.0, 0.0, location)
+        return {"data": [row] * limit, "next_cursor": (row.timestamp, row.id)}
+
+    def get_average_temperatures(self, location, start_date, end_date):
+        self.calls.append(("get_average_temperatures", location, start_date, end_date))
+        return None
+
+    def get_extreme_weather_events(self, threshold_temp=35.0, threshold_precip=50.0,
+                                   limit=1000, cursor_ts=None, cursor_id=None):
+        self.calls.append(("get_extreme_weather_events", threshold_temp, threshold_precip,
+                           limit, cursor_ts, cursor_id))
+        return {"data": [], "next_cursor": None}
 
+    def bulk_copy_weather_records(self, records, refresh=False):
+        if self.load_error:
+            raise self.load_error
+        self.loaded.extend(records)
+        if refresh:
+            self.refresh_daily_aggregates()
+        return len(records)
 
+    def refresh_daily_aggregates(self):
+        self.refreshes += 1
+
+
+fake_db = FakeWeatherDatabase()
+app.dependency_overrides[get_db] = lambda: fake_db
+
+
+async def test_read_main(client):
+    """Test the root endpoint"""
+    response = await client.get("/")
     assert response.status_code == 200
     assert response.json() == {"message": "Welcome to MedClimate API"}
 
 
-def test_health_check():
+async def test_health_check(client):
     """Test the health check endpoint"""
-    response=MedAPI.get("/health")
+    response = await client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
+
+
+async def test_records_by_location(client):
+    """Test the records endpoint forwards its query to the database"""
+    response = await client.get("/weather/Medellin",
+                                params={"start_date": "2024-01-01T00:00:00", "limit": 1})
+    assert response.status_code == 200
+    assert response.json() == {
+        "data": [{"id": 1, "timestamp": "2024-01-01T12:00:00", "temperature": 23.5,
+                  "humidity": 65.0, "precipitation": 0.0, "location": "Medellin"}],
+        "next_cursor": {"cursor_ts": "2024-01-01T12:00:00", "cursor_id": 1}
+    }
+    assert fake_db.calls[-1] == ("get_records_by_location", "Medellin",
+                                 datetime(2024, 1, 1), 1, None, None)
+
+
+async def test_records_cursor_forwarded(client):
+    """Test the keyset cursor is passed through to the database"""
+    response = await client.get("/weather/Medellin",
+                                params={"cursor_ts": "2024-01-01T12:00:00", "cursor_id": 1})
+    assert response.status_code == 200
+    assert fake_db.calls[-1] == ("get_records_by_location", "Medellin", None,
+                                 1000, datetime(2024, 1, 1, 12), 1)
+
+
+async def test_incomplete_cursor_rejected(client):
+    """Test a cursor missing its id is rejected"""
+    response = await client.get("/weather/Medellin", params={"cursor_ts": "2024-01-01T12:00:00"})
+    assert response.status_code == 422
+
+
+async def test_stats_not_found(client):
+    """Test the stats endpoint returns 404 when there are no records"""
+    response = await client.get("/weather/Medellin/stats",
+                                params={"start_date": "2024-01-01", "end_date": "2024-02-01"})
+    assert response.status_code == 404
+
+
+async def test_extremes_route_not_captured_by_location(client):
+    """Test /weather/extremes isn't treated as a location"""
+    response = await client.get("/weather/extremes", params={"threshold_temp": 30})
+    assert response.status_code == 200
+    assert response.json() == {"data": [], "next_cursor": None}
+    assert fake_db.calls[-1] == ("get_extreme_weather_events", 30.0, 50.0, 1000, None, None)
+
+
+async def test_bulk_insert_ndjson(client):
+    """Test every line of an NDJSON body is loaded"""
+    fake_db.loaded.clear()
+    body = "\n".join(
+        f'{{"timestamp": "2024-01-01T{hour:02d}:00:00", "temperature": 20.0, '
+        f'"humidity": 70.0, "precipitation": 0.0, "location": "Medellin"}}'
+        for hour in range(3)
+    )
+    response = await client.post("/weather/bulk", content=body)
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 3}
+    assert [r["timestamp"] for r in fake_db.loaded] == [
+        datetime(2024, 1, 1, hour) for hour in range(3)
+    ]
+
+
+
+async def test_bulk_insert_rejects_incomplete_record(client):
+    """Test a record missing a column is rejected with its line number"""
+    response = await client.post("/weather/bulk", content='{"timestamp": "2024-01-01"}\n')
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 1
+
+
+VALID_LINE = ('{"timestamp": "2024-01-01T00:00:00", "temperature": 20.0, '
+              '"humidity": 70.0, "precipitation": 0.0, "location": "Medellin"}')
+
+
+@pytest.mark.parametrize("invalid_line", [
+    VALID_LINE.replace('"temperature": 20.0', '"temperature": "hot"'),
+    VALID_LINE.replace('"2024-01-01T00:00:00"', '"yesterday"'),
+    VALID_LINE.replace('"location": "Medellin"', '"location": ""'),
+])
+async def test_bulk_insert_rejects_invalid_values(client, invalid_line):
+    """Test values of the wrong type are rejected before reaching the database"""
+    fake_db.loaded.clear()
+    response = await client.post("/weather/bulk", content=f"{VALID_LINE}\n{invalid_line}\n")
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 2
+    assert fake_db.loaded == []
+
+
+async def test_bulk_insert_maps_database_data_errors(client):
+    """Test a batch rejected by the database is reported as 422"""
+    fake_db.load_error = psycopg2.errors.StringDataRightTruncation("value too long")
+    try:
+        response = await client.post("/weather/bulk", content=VALID_LINE)
+    finally:
+        fake_db.load_error = None
+    assert response.status_code == 422
+    assert response.json()["detail"]["inserted"] == 0
+
+
+async def test_bulk_insert_leaves_refresh_to_background(client, monkeypatch):
+    """Test uploads only flag the daily aggregates as stale"""
+    monkeypatch.setattr("medclimate.api.api.BULK_BATCH_SIZE", 2)
+    aggregates_stale.clear()
+    fake_db.refreshes = 0
+    response = await client.post("/weather/bulk", content="\n".join([VALID_LINE] * 5))
+    assert response.json() == {"inserted": 5}
+    assert fake_db.refreshes == 0
+    assert aggregates_stale.is_set()
+
+
+async def test_stale_aggregates_refreshed_at_most_once_per_interval():
+    """Test the background task refreshes once, then waits out the interval"""
+    fake_db.refreshes = 0
+    aggregates_stale.set()
+    refresher = asyncio.create_task(refresh_stale_aggregates(fake_db, interval=60))
+    try:
+        for _ in range(100):
+            if fake_db.refreshes:
+                break
+            await asyncio.sleep(0.01)
+        aggregates_stale.set()
+        await asyncio.sleep(0.05)
+    finally:
+        refresher.cancel()
+    assert fake_db.refreshes == 1
+    aggregates_stale.clear()
+
+
+async def test_large_responses_are_gzipped(client):
+    """Test responses above the size threshold are compressed"""
+    response = await client.get("/weather/Medellin", params={"limit": 100},
+                                headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["data"]) == 100
+
+
+async def test_cors_preflight_is_cacheable(client):
+    """Test preflight responses allow the configured origin and set max-age"""
+    response = await client.options("/weather/Medellin", headers={
+        "Origin": "http://localhost:3000",
+        "Access-Control-Request-Method": "GET",
+    })
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert response.headers["access-control-max-age"] == "86400"
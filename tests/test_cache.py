@@ -0,0 +1,57 @@
+from medclimate.utils.cache import TTLCache
+
+
+def test_get_returns_cached_value():
+    """Test a stored value is returned until it expires"""
+    cache = TTLCache(ttl=60)
+    cache.set(("Medellin", None), [1, 2, 3])
+    assert cache.get(("Medellin", None)) == [1, 2, 3]
+    assert cache.get(("Bogota", None)) is None
+
+
+def test_expired_entries_are_dropped():
+    """Test entries past their TTL are treated as missing"""
+    cache = TTLCache(ttl=-1)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+
+def test_oldest_entry_evicted_when_full():
+    """Test the cache never grows beyond maxsize"""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_entries_evicted_by_total_size():
+    """Test sized entries evict the oldest ones until the total fits"""
+    cache = TTLCache(maxsize=10)
+    cache.set("a", "rows", size=4)
+    cache.set("b", "rows", size=4)
+    cache.set("c", "rows", size=4)
+    assert cache.get("a") is None
+    assert cache.get("b") == "rows"
+    assert cache.get("c") == "rows"
+
+
+def test_entries_larger_than_maxsize_not_cached():
+    """Test a value bigger than the whole cache is skipped, not stored"""
+    cache = TTLCache(maxsize=10)
+    cache.set("a", "rows", size=4)
+    cache.set("huge", "rows", size=11)
+    assert cache.get("huge") is None
+    assert cache.get("a") == "rows"
+
+
+def test_invalidate_by_predicate():
+    """Test invalidation only removes matching keys"""
+    cache = TTLCache()
+    cache.set(("Medellin", None), 1)
+    cache.set(("Bogota", None), 2)
+    cache.invalidate(lambda key: key[0] == "Medellin")
+    assert cache.get(("Medellin", None)) is None
+    assert cache.get(("Bogota", None)) == 2
@@ -0,0 +1,248 @@
+import os
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+
+from medclimate.database.postgeresql import (
+    COPY_THRESHOLD, WeatherDatabase, _checked_months, _records_cache
+)
+from medclimate.utils.config import get_settings
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DB_NAME"),
+    reason="set TEST_DB_NAME (and DB_USER/DB_PASSWORD/DB_HOST) to a throwaway database"
+)
+
+
+def make_records(count, location="Medellin", start=datetime(2024, 1, 1)):
+    return [{"timestamp": start + timedelta(hours=i), "temperature": 20.0 + i % 10,
+             "humidity": 70.0, "precipitation": 0.0, "location": location}
+            for i in range(count)]
+
+
+@pytest.fixture(scope="module")
+def db():
+    """A freshly created schema, shared by the module"""
+    database = WeatherDatabase()
+    with database.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DROP MATERIALIZED VIEW IF EXISTS weather_daily_agg;"
+                        "DROP TABLE IF EXISTS weather_records CASCADE;")
+        conn.commit()
+    _checked_months.clear()
+    database.create_tables()
+    return database
+
+
+@pytest.fixture(autouse=True)
+def empty_table(db):
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE weather_records RESTART IDENTITY;")
+        conn.commit()
+    db.refresh_daily_aggregates()
+    _records_cache().clear()
+
+
+def stored_timestamps(db, location="Medellin"):
+    return [row.timestamp for row in db.get_records_by_location(location)["data"]]
+
+
+def query_one(db, query, params=()):
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchone()[0]
+
+
+def partition_exists(db, month):
+    return query_one(db, "SELECT to_regclass(%s) IS NOT NULL",
+                     (WeatherDatabase._partition_name(month),))
+
+
+def test_insert_weather_record_without_warnings(db):
+    """Test a single insert returns its ID and compiles cleanly"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        record_id = db.insert_weather_record(make_records(1)[0])
+    assert record_id == 1
+
+
+def test_insert_weather_records_returns_ids_in_order(db):
+    """Test a multi-row insert returns one ID per record, in input order"""
+    records = make_records(3)
+    assert db.insert_weather_records(records) == [1, 2, 3]
+    assert stored_timestamps(db) == [r["timestamp"] for r in reversed(records)]
+
+
+def test_bulk_copy_small_batch_uses_insert(db):
+    """Test batches under COPY_THRESHOLD load through the INSERT fallback"""
+    assert db.bulk_copy_weather_records(make_records(5)) == 5
+    assert len(stored_timestamps(db)) == 5
+
+
+def test_bulk_copy_large_batch(db):
+    """Test batches above COPY_THRESHOLD load through COPY, NULLs included"""
+    records = make_records(COPY_THRESHOLD + 50)
+    records[0]["humidity"] = None
+    assert db.bulk_copy_weather_records(records) == len(records)
+    rows = db.get_records_by_location("Medellin", limit=1000)["data"]
+    assert len(rows) == len(records)
+    assert rows[-1].humidity is None
+
+
+@pytest.mark.parametrize("read", [
+    lambda db: db.get_records_by_location("Medellin", limit=0),
+    lambda db: db.get_extreme_weather_events(limit=0),
+])
+def test_pages_require_positive_limit(db, read):
+    """Test a zero page size is rejected instead of failing on an empty page"""
+    db.insert_weather_record(make_records(1)[0])
+    with pytest.raises(ValueError, match="limit"):
+        read(db)
+
+
+@pytest.mark.parametrize("read", [
+    lambda db, **page: db.get_records_by_location("Medellin", **page),
+    lambda db, **page: db.get_extreme_weather_events(threshold_temp=35.0, **page),
+])
+@pytest.mark.parametrize("count", [10, 12])
+def test_keyset_pages_visit_every_row_once(db, read, count):
+    """Test paging through duplicate timestamps neither repeats nor skips rows"""
+    records = make_records(count)
+    for i, record in enumerate(records):
+        record["timestamp"] = datetime(2024, 1, 1, i // 3)
+        record["temperature"] = 40.0
+    timestamps = dict(zip(db.insert_weather_records(records),
+                          (r["timestamp"] for r in records)))
+
+    seen, cursor = [], {}
+    while True:
+        page = read(db, limit=4, **cursor)
+        seen.extend(row.id for row in page["data"])
+        if page["next_cursor"] is None:
+            break
+        cursor = dict(zip(("cursor_ts", "cursor_id"), page["next_cursor"]))
+    # Newest first, ties broken by id
+    assert seen == sorted(timestamps, key=lambda i: (timestamps[i], i), reverse=True)
+
+
+@pytest.mark.parametrize("count", [48, COPY_THRESHOLD + 20])
+def test_bulk_copy_leaves_refresh_to_caller(db, count):
+    """Test whole days loaded in bulk show up in the stats once refreshed"""
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(hours=count)
+    db.bulk_copy_weather_records(make_records(count, start=start))
+    assert db.get_average_temperatures("Medellin", start, end) is None
+    db.refresh_daily_aggregates()
+    assert db.get_average_temperatures("Medellin", start, end)["total_records"] == count
+
+
+def test_stats_accept_timezone_aware_bounds(db):
+    """Test aware bounds (e.g. a Z suffix) are read as UTC, not rejected"""
+    db.bulk_copy_weather_records(make_records(48))
+    db.refresh_daily_aggregates()
+    aware = db.get_average_temperatures(
+        "Medellin",
+        datetime.fromisoformat("2024-01-01T10:00:00Z"),
+        datetime.fromisoformat("2024-01-02T05:00:00-05:00")
+    )
+    naive = db.get_average_temperatures(
+        "Medellin", datetime(2024, 1, 1, 10), datetime(2024, 1, 2, 10)
+    )
+    assert aware == naive
+    assert aware["total_records"] == 25
+
+
+def test_insert_and_copy_store_records_alike(db):
+    """Test a record is stored the same whether it goes through INSERT or COPY"""
+    record = {"timestamp": datetime.fromisoformat("2024-01-01T05:00:00-05:00"),
+              "temperature": 20.0, "humidity": None, "precipitation": 0.0, "location": ""}
+    db.bulk_copy_weather_records([record])
+    db.bulk_copy_weather_records([record] * COPY_THRESHOLD)
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT timestamp, humidity, location FROM weather_records")
+            assert cur.fetchall() == [(datetime(2024, 1, 1, 10), None, "")]
+
+
+@pytest.mark.parametrize("count", [1, COPY_THRESHOLD])
+def test_inserts_create_monthly_partitions(db, count):
+    """Test rows of months beyond create_tables get their own partition"""
+    months = [datetime(2031, 6, 1), datetime(2031, 7, 1)]
+    records = make_records(count, start=months[0]) + make_records(count, start=months[1])
+    db.bulk_copy_weather_records(records)
+    assert all(partition_exists(db, month) for month in months)
+    assert query_one(db, "SELECT count(*) FROM weather_records_default") == 0
+
+
+def test_months_held_by_default_partition_are_skipped(db):
+    """Test create_tables still runs when the default partition holds a month"""
+    month = datetime(2035, 3, 1)
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO weather_records_default (timestamp, location) "
+                        "VALUES (%s, 'Medellin')", (month,))
+        conn.commit()
+    db.create_monthly_partitions(month)
+    db.create_tables()
+    assert not partition_exists(db, month)
+
+
+def test_drop_monthly_partition_clears_cached_pages(db):
+    """Test records of a dropped month are not served from the cache"""
+    month = datetime(2031, 6, 1)
+    db.insert_weather_records(make_records(3, start=month))
+    assert len(stored_timestamps(db)) == 3
+    db.drop_monthly_partition(month)
+    assert stored_timestamps(db) == []
+
+
+@pytest.fixture
+def daily_records(db):
+    """Days 2024-01-01..07, each with readings of 10 + day and 20 + day"""
+    db.insert_weather_records([
+        {"timestamp": datetime(2024, 1, 1 + day, hour), "temperature": base + day,
+         "humidity": 70.0, "precipitation": 0.0, "location": "Medellin"}
+        for day in range(7) for hour, base in ((6, 10.0), (18, 20.0))
+    ])
+    db.refresh_daily_aggregates()
+
+
+def rolling(row):
+    return (row["day"], row["rolling_avg_temp"], row["rolling_min_temp"],
+            row["rolling_max_temp"], row["total_records"])
+
+
+@pytest.mark.parametrize("prepared", [True, False])
+def test_rolling_temperature_windows(db, daily_records, monkeypatch, prepared):
+    """Test the first window only covers its own day and later ones span three"""
+    monkeypatch.setattr(get_settings(), "DB_PREPARED_STATEMENTS", prepared)
+    rows = db.get_rolling_temperature("Medellin", datetime(2024, 1, 1),
+                                      datetime(2024, 1, 7), window=timedelta(days=3))
+    assert len(rows) == 7
+    assert rolling(rows[0]) == (datetime(2024, 1, 1), 15.0, 10.0, 20.0, 2)
+    assert rolling(rows[4]) == (datetime(2024, 1, 5), 18.0, 12.0, 24.0, 6)
+
+
+@pytest.mark.parametrize("prepared", [True, False])
+def test_rolling_temperature_reads_days_before_start(db, daily_records, monkeypatch,
+                                                     prepared):
+    """Test the first reported window is complete, using days before start_date"""
+    monkeypatch.setattr(get_settings(), "DB_PREPARED_STATEMENTS", prepared)
+    rows = db.get_rolling_temperature("Medellin", datetime(2024, 1, 4, 12),
+                                      datetime(2024, 1, 7), window=timedelta(days=3))
+    assert [row["day"] for row in rows] == [datetime(2024, 1, day) for day in range(4, 8)]
+    assert rolling(rows[0]) == (datetime(2024, 1, 4), 17.0, 11.0, 23.0, 6)
+
+
+@pytest.mark.parametrize("prepared", [True, False])
+def test_extreme_events_include_threshold_value(db, monkeypatch, prepared):
+    """Test a REAL reading equal to the threshold counts as extreme"""
+    monkeypatch.setattr(get_settings(), "DB_PREPARED_STATEMENTS", prepared)
+    record = make_records(1)[0]
+    record["temperature"] = 35.1
+    db.insert_weather_record(record)
+    events = db.get_extreme_weather_events(threshold_temp=35.1)["data"]
+    assert [event.temperature for event in events] == [pytest.approx(35.1)]